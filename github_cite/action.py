@@ -28,20 +28,28 @@ import sys
 import os
 
 def set_github_action_output(output_name, output_value):
-    f = open(os.path.abspath(os.environ["GITHUB_OUTPUT"]), "a")
-    f.write(f'{output_name}<<EOF\n{output_value}\nEOF\n')
-    f.close()
+    # Large buffer so the whole XML is flushed with a single write
+    with open(os.environ["GITHUB_OUTPUT"], "a", buffering=1 << 16) as f:
+        f.write(f'{output_name}<<EOF\n{output_value}\nEOF\n')
+
+def read_github_action_inputs():
+    """Read all action inputs from the environment at once, defaults match action.yml"""
+    env = os.environ
+    return {
+        "repoOwner": env["INPUT_REPOOWNER"],
+        "repoName": env["INPUT_REPONAME"],
+        "apiToken": env["INPUT_APITOKEN"],
+        "githubUrl": env.get("INPUT_GITHUBURL", "https://github.com"),
+        "githubApiUrl": env.get("INPUT_GITHUBAPIURL", "https://api.github.com"),
+    }
 
 if __name__ == "__main__":
-    repo_owner = os.environ["INPUT_REPOOWNER"]
-    repo_name = os.environ["INPUT_REPONAME"]
-    api_token = os.environ["INPUT_APITOKEN"]
-    github_url = os.environ["INPUT_GITHUBURL"]
-    github_api_url = os.environ["INPUT_GITHUBAPIURL"]
+    inputs = read_github_action_inputs()
     try:
-        data = GithubRepoDataCite(repo_owner, repo_name, githubApiUrl=github_api_url, githubUrl=github_url, barerToken=api_token)
-        sys.stdout.write(data.pretty_xml())
-        set_github_action_output('datacitexml', data.pretty_xml())
+        data = GithubRepoDataCite(inputs["repoOwner"], inputs["repoName"], githubApiUrl=inputs["githubApiUrl"], githubUrl=inputs["githubUrl"], barerToken=inputs["apiToken"])
+        xml = data.pretty_xml()
+        sys.stdout.write(xml)
+        set_github_action_output('datacitexml', xml)
         
     except GithubException as e:
         sys.stderr.write(f"An exception occurred:\n{e.message}")
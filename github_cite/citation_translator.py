@@ -21,7 +21,22 @@
 # SOFTWARE.
 
 from github_client import GithubClient
-from xml.dom.minidom import Document, Element
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+
+XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+DATACITE_NAMESPACE = "http://datacite.org/schema/kernel-4"
+
+def _sub(parent: etree._Element, tag: str, text: str | None = None, **attrs):
+  """Append a child element with optional text, attributes set to None are skipped"""
+  element = etree.SubElement(parent, tag)
+  if text is not None:
+    element.text = text
+  for key, value in attrs.items():
+    if value is not None:
+      element.set(key, value)
+  return element
 
 class GithubRepoDataCite:
   """Contains the DataCite format for one repository.
@@ -32,7 +47,7 @@ class GithubRepoDataCite:
       pretty_xml()
         Returns the DataCite XML document in pretty format.
   """
-  def __init__(self, repoOwner: str, repoName: str, githubApiUrl: str = "https://api.github.com", githubUrl: str = "https://github.com", barerToken: str | None = None):
+  def __init__(self, repoOwner: str, repoName: str, githubApiUrl: str = "https://api.github.com", githubUrl: str = "https://github.com", barerToken: str | None = None, rSession: requests.Session | None = None):
     """ Constructor, will create the dataCite format
 
       Parameters
@@ -43,197 +58,136 @@ class GithubRepoDataCite:
           The name of the repository
         barerToken: str | None, optional
           Authentication token to GitHub, default = None
+        rSession: requests.Session | None, optional
+          Shared REST session, see github_client.create_rest_session(), default = None
 
       Raises
       ------
         GithubException
           If there are any exceptions talking with GitHub
     """
-    self.client = GithubClient(repoOwner=repoOwner, repoName=repoName, barerToken=barerToken)
-    self.base_data = self.client.get_info()
+    self.client = GithubClient(repoOwner=repoOwner, repoName=repoName, githubApiUrl=githubApiUrl, githubUrl=githubUrl, barerToken=barerToken, rSession=rSession)
+    self._xml_cache = None
+    # The contributors are fetched with their own transport while the other requests run.
+    # All other GraphQL requests share one transport, so they have to stay on this thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+      contributers = executor.submit(self.client.get_contributors)
+      self.__build__()
+      self.contributers = contributers.result()
+
+    creators = _sub(self.root, "creators")
+    self.__add_creators__(creators)
+
+  def __build__(self):
+    """Build everything except the creators, which wait for the contributors"""
+    info = self.base_data = self.client.get_info()
     # print(self.base_data)
-    self.contributers = self.client.get_contributors()
-    self.doc = Document()
-    self.root = self.doc.createElement('resource')
-    self.doc.appendChild(self.root)
-    self.__add_base_data__(self.root)
+    parent = info.get('parent')
+    license = info.get('licenseInfo')
+    defaultRef = info.get('defaultBranchRef') or {}
 
-    relatedIdentifiers = self.doc.createElement('relatedIdentifiers')
+    self.root = etree.Element('resource', nsmap={None: DATACITE_NAMESPACE, "xsi": XSI_NAMESPACE})
+    self.__add_base_data__(self.root, info, license)
+
+    relatedIdentifiers = _sub(self.root, 'relatedIdentifiers')
 
     # Add release identifiers
-    for release in reversed(self.client.list_releases()): # reversed so the newest are at the top
-      releaseIdentifier = self.doc.createElement('relatedIdentifier')
-      releaseIdentifier.setAttribute("relatedIdentifierType", "URL")
-      releaseIdentifier.setAttribute("relationType", "HasVersion")
-      releaseIdentifier.appendChild(self.doc.createTextNode(f"{self.client.githubRepoUrl}/releases/tag/{release['tag_name']}"))
-      relatedIdentifiers.appendChild(releaseIdentifier)
+    for release in self.client.list_releases(): # the query orders them newest first
+      _sub(relatedIdentifiers, 'relatedIdentifier', f"{self.client.githubRepoUrl}/releases/tag/{release['tag_name']}", relatedIdentifierType="URL", relationType="HasVersion")
 
     # Add branch identifiers
     for branch in self.client.list_branches():
-      branchIdentifier = self.doc.createElement('relatedIdentifier')
-      branchIdentifier.setAttribute("relatedIdentifierType", "URL")
-      branchIdentifier.setAttribute("relationType", "IsVariantFormOf")
-      branchIdentifier.appendChild(self.doc.createTextNode(f"{self.client.githubRepoUrl}/tree/{branch['name']}"))
-      relatedIdentifiers.appendChild(branchIdentifier)
-
-    self.__add_parent_related_identifiers__(relatedIdentifiers)
+      _sub(relatedIdentifiers, 'relatedIdentifier', f"{self.client.githubRepoUrl}/tree/{branch['name']}", relatedIdentifierType="URL", relationType="IsVariantFormOf")
 
-    self.root.appendChild(relatedIdentifiers)
+    if parent != None:
+      self.__add_parent_related_identifiers__(relatedIdentifiers, defaultRef, parent)
 
-    creators = self.doc.createElement("creators")
-    self.__add_creators__(creators)
-    self.root.appendChild(creators)
-
-  def __add_parent_related_identifiers__(self, relatedIdentifiers: Element):
-    if self.__get__data__('parent') == None:
-      return
-    
+  def __add_parent_related_identifiers__(self, relatedIdentifiers: etree._Element, defaultRef: dict, parent: dict):
     # Add related identifier in the fork context
-    forkIdentifier = self.doc.createElement("relatedIdentifier")
-    forkIdentifier.setAttribute("relatedIdentifierType", "URL")
-    forkIdentifier.setAttribute("relationType", "IsDerivedFrom")
-    parentUrl = self.client.githubParentRepoUrl
-    forkIdentifier.appendChild(self.doc.createTextNode(parentUrl))
-    relatedIdentifiers.appendChild(forkIdentifier)
+    _sub(relatedIdentifiers, "relatedIdentifier", self.client.githubParentRepoUrl, relatedIdentifierType="URL", relationType="IsDerivedFrom")
 
     # find last release befor commit
-    currentRef = self.__get__data__("defaultBranchRef", "prefix") + self.__get__data__("defaultBranchRef", "name")
-    parentRef = self.__get__data__("parent", "defaultBranchRef", "prefix") + self.__get__data__("parent", "defaultBranchRef", "name")
+    parentDefaultRef = parent['defaultBranchRef']
+    currentRef = defaultRef['prefix'] + defaultRef['name']
+    parentRef = parentDefaultRef['prefix'] + parentDefaultRef['name']
     lastCommonCommit = self.client.get_last_common_commit(currentRef, parentRef)
     if lastCommonCommit == None:
       return
 
     # Add commit as related identifier
-    lastCommonCommitIdentifier = self.doc.createElement("relatedIdentifier")
-    lastCommonCommitIdentifier.setAttribute("relatedIdentifierType", "URL")
-    lastCommonCommitIdentifier.setAttribute("relationType", "IsDerivedFrom")
-    lastCommonCommitIdentifier.appendChild(self.doc.createTextNode(f"{self.client.githubParentRepoUrl}/commit/{lastCommonCommit['oid']}"))
-    relatedIdentifiers.appendChild(lastCommonCommitIdentifier)
+    _sub(relatedIdentifiers, "relatedIdentifier", f"{self.client.githubParentRepoUrl}/commit/{lastCommonCommit['oid']}", relatedIdentifierType="URL", relationType="IsDerivedFrom")
 
     # Get last common release
     forkedRelease = self.client.get_last_parent_release_before(lastCommonCommit['committedDate'])
     if forkedRelease == None:
       return
 
-    versionIdentifier = self.doc.createElement("relatedIdentifier")
-    versionIdentifier.setAttribute("relatedIdentifierType", "URL")
-    versionIdentifier.setAttribute("relationType", "IsDerivedFrom")
-    # relatedIdentifier.setAttribute("archived", archived)
+    relatedIdentifierUrl = f"https://github.com/{parent['owner']['login']}/{parent['name']}/releases/tag/{forkedRelease['tag_name']}"
+    _sub(relatedIdentifiers, "relatedIdentifier", relatedIdentifierUrl, relatedIdentifierType="URL", relationType="IsDerivedFrom")
 
-    relatedIdentifierUrl = f"https://github.com/{self.__get__data__('parent', 'owner', 'login')}/{self.__get__data__('parent', 'name')}/releases/tag/{forkedRelease['tag_name']}"
-
-    versionIdentifier.appendChild(self.doc.createTextNode(relatedIdentifierUrl))
-    relatedIdentifiers.appendChild(versionIdentifier)
-
-  def __add_base_data__(self, resourceElement: Element):
+  def __add_base_data__(self, resourceElement: etree._Element, info: dict, license: dict | None):
     """Add basic information to the resource element"""
     # Add basic schema information
-    resourceElement.setAttribute("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-    resourceElement.setAttribute("xmlns", "http://datacite.org/schema/kernel-4")
-    resourceElement.setAttribute("xsi:schemaLocation", "http://datacite.org/schema/kernel-4 http://schema.datacite.org/meta/kernel-4/metadata.xsd")
+    resourceElement.set(f"{{{XSI_NAMESPACE}}}schemaLocation", "http://datacite.org/schema/kernel-4 http://schema.datacite.org/meta/kernel-4/metadata.xsd")
 
     # resource Type is Software
-    type = self.doc.createElement("resourceType")
-    type.appendChild(self.doc.createTextNode("Software"))
-    type.setAttribute("resourceTypeGeneral", "Software")
-    resourceElement.appendChild(type)
+    _sub(resourceElement, "resourceType", "Software", resourceTypeGeneral="Software")
 
     # Publisher
-    publisher = self.doc.createElement("publisher")
-    publisher.appendChild(self.doc.createTextNode("GitHub"))
-    resourceElement.appendChild(publisher)
+    _sub(resourceElement, "publisher", "GitHub")
 
     # For now use last pushed data as publicationYear, to be changed in specification
-    publicationYear = self.doc.createElement("publicationYear")
-    publicationYear.appendChild(self.doc.createTextNode(self.__get__data__('pushedAt')[:4]))
-    resourceElement.appendChild(publicationYear)
+    _sub(resourceElement, "publicationYear", info['pushedAt'][:4])
 
     # Add base-repo identifier
-    identifier = self.doc.createElement("identifier")
-    identifier.setAttribute("identifierType", "URL")
-    identifier.appendChild(self.doc.createTextNode(self.__get__data__('url')))
-    resourceElement.appendChild(identifier)
+    _sub(resourceElement, "identifier", info['url'], identifierType="URL")
 
     # Add title
-    titles = self.doc.createElement("titles")
-    title = self.doc.createElement("title")
-    title.appendChild(self.doc.createTextNode(self.__get__data__('name')))
-    titles.appendChild(title)
+    titles = _sub(resourceElement, "titles")
+    _sub(titles, "title", info['name'])
 
     # subtitle
-    subtitle = self.doc.createElement("title")
-    subtitle.setAttribute("titleType", "Subtitle")
-    subtitle.appendChild(self.doc.createTextNode(self.__get__data__("description")))
-    titles.appendChild(subtitle)
-    resourceElement.appendChild(titles)
-
-    # Add licence
-    licenceName = self.__get__data__("licenseInfo", "name")
-    if licenceName != None:
-      rightsList = self.doc.createElement("rightsList")
-      license = self.doc.createElement("rights")
-      licenceUrl = self.__get__data__("licenseInfo", "url")
-      if licenceUrl != None:
-        license.setAttribute("rightsURI", licenceUrl)
-      license.setAttribute("rightsIdentifierScheme", "spdx")
-      licenceId = self.__get__data__("licenseInfo", "spdxId")
-      if licenceId != None:
-        license.setAttribute("rightsIdentifier", licenceId)
-      license.appendChild(self.doc.createTextNode(licenceName))
-      rightsList.appendChild(license)
-      resourceElement.appendChild(rightsList)
+    _sub(titles, "title", info['description'], titleType="Subtitle")
+
+    # Add licence, repositories without one have licenseInfo set to null
+    if license:
+      rightsList = _sub(resourceElement, "rightsList")
+      _sub(rightsList, "rights", license.get('name'),
+        rightsURI=license.get('url'),
+        rightsIdentifierScheme="spdx",
+        rightsIdentifier=license.get('spdxId'))
 
     # Add dates
-    dates = self.doc.createElement("dates")
-    createdDate = self.doc.createElement("date")
-    createdDate.setAttribute("dateType", "Created")
-    createdDate.appendChild(self.doc.createTextNode(self.__get__data__('createdAt')))
-    dates.appendChild(createdDate)
-
-    updatedDate = self.doc.createElement("date")
-    updatedDate.setAttribute("dateType", "Updated")
-    updatedDate.appendChild(self.doc.createTextNode(self.__get__data__('pushedAt')))
-    dates.appendChild(updatedDate)
-    resourceElement.appendChild(dates)
-
-  def __add_creators__(self, creators: Element):
+    dates = _sub(resourceElement, "dates")
+    _sub(dates, "date", info['createdAt'], dateType="Created")
+    _sub(dates, "date", info['pushedAt'], dateType="Updated")
+
+  def __add_creators__(self, creators: etree._Element):
     # Add Creator
     def create_creator(c):
-      creator = self.doc.createElement("creator")
-      creatorName = self.doc.createElement("creatorName")
-      creatorName.setAttribute("nameType", "Personal")
-
-      if 'name' in c and c['name']:
-        creatorName.appendChild(self.doc.createTextNode(c['name']))
-        creator.appendChild(creatorName)
-        split_name = list(c['name'].split(" "))
-        if len(split_name) > 1:
-          givenName = self.doc.createElement("givenName")
-          givenName.appendChild(self.doc.createTextNode(split_name[0]))
-          creator.appendChild(givenName)
-
-          familyName = self.doc.createElement("familyName")
-          familyName.appendChild(self.doc.createTextNode(split_name[-1]))
-          creator.appendChild(familyName)
+      creator = _sub(creators, "creator")
+
+      name = c.get('name')
+      if name:
+        _sub(creator, "creatorName", name, nameType="Personal")
+        # Single word names only get a creatorName
+        if " " in name:
+          givenName, _, rest = name.partition(" ")
+          _sub(creator, "givenName", givenName)
+          _sub(creator, "familyName", rest.rpartition(" ")[2])
       else:
-        creatorName.appendChild(self.doc.createTextNode(c['login']))
-        creator.appendChild(creatorName)
+        _sub(creator, "creatorName", c['login'], nameType="Personal")
       return creator
     
     
     for c in self.contributers:
-      creators.appendChild(create_creator(c))
-  
-  def __get__data__(self, *path):
-    current = self.base_data
-    for step in path:
-      if current != None and step in current:
-        current = current[step]
-      else:
-        return None
-    return current
+      create_creator(c)
   
   def pretty_xml(self):
     """ Returns the DataCity XML in pretty format
+
+      The document is only serialized on the first call, later calls return the cached string.
     """
-    return self.doc.toprettyxml()
+    if self._xml_cache is None:
+      self._xml_cache = etree.tostring(self.root, pretty_print=True, xml_declaration=True, encoding='UTF-8').decode()
+    return self._xml_cache
@@ -26,10 +26,404 @@ from gql.transport.aiohttp import AIOHTTPTransport
 from gql.transport.exceptions import TransportQueryError, TransportServerError
 from aiohttp.client_exceptions import ClientResponseError
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from cachetools import LRUCache, TTLCache
+import asyncio
+import hashlib
+import bisect
+import threading
+import time
+from email.utils import parsedate_to_datetime
 
 from exceptions import GithubException
 
+# Retries after GitHub answered with a rate limit.
+# The wait follows Retry-After, a limit that is lifted later than MAX_RATE_LIMIT_WAIT seconds is not waited for.
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 60
+RATE_LIMIT_MESSAGE = "GitHub rate limit exceeded. Please us a GitHub API token or try again later."
+
+# Requests per minute sent to GitHub by one process, below the secondary rate limit of 900 points per minute.
+# Each gunicorn worker is its own process with its own bucket.
+MAX_REQUESTS_PER_MINUTE = 900
+
+# Seconds to wait for a REST response, requests would otherwise wait forever
+REST_TIMEOUT = 30
+
+class _TokenBucket:
+  """Paces requests of all threads in the process, so bursts wait instead of hitting GitHub's rate limit"""
+  def __init__(self, rate: int, period: float):
+    self.capacity = rate
+    self.tokens = rate
+    self.refillRate = rate / period
+    self.updated = time.monotonic()
+    self.lock = threading.Lock()
+
+  def take(self):
+    """Take one token, sleeping until the bucket has refilled it if it is empty"""
+    with self.lock:
+      now = time.monotonic()
+      self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refillRate)
+      self.updated = now
+      # The token is reserved even if it is missing, so waiting threads are served in order
+      self.tokens -= 1
+      wait = -self.tokens / self.refillRate
+    if wait > 0:
+      time.sleep(wait)
+
+_rateLimiter = _TokenBucket(MAX_REQUESTS_PER_MINUTE, 60)
+
+# Commit history pages after a cursor never change, they are shared by all clients in the process.
+# The cursor points at a fixed commit, new commits only change the first page.
+_commitPageCache = LRUCache(maxsize=512)
+_commitPageCacheLock = threading.Lock()
+
+# Repository info, branches and releases change rarely, repeated requests for the
+# same repository within five minutes are answered from this cache.
+_repoCache = TTLCache(maxsize=1024, ttl=300)
+_repoCacheLock = threading.Lock()
+
+# Queries are parsed once at import time and reused for every request and page
+_INFO_QUERY = gql(
+  """
+  query ReleaseInfo($repoOwner: String!, $repoName: String!) {
+    repository (owner: $repoOwner, name: $repoName) {
+      ...RepoInfo
+      refs(refPrefix:"refs/heads/", first: 100){
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          name
+        }
+      }
+      releases (first: 100, orderBy: {field: CREATED_AT, direction: DESC} ){
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+        edges {
+          node {
+            name
+            tag {
+              name
+              target {
+                ... on Commit {
+                  committedDate
+                  oid
+                }
+              }
+            }
+          }
+        }
+      }
+      parent {
+        defaultBranchRef {
+          prefix
+          name
+        }
+        name
+        isArchived
+        owner {
+          login
+        }
+        releases (first: 100, orderBy: {field: CREATED_AT, direction: DESC} ){
+          ...ReleaseDatesPage
+        }
+      }
+    }
+  }
+  fragment ReleaseDatesPage on ReleaseConnection {
+    pageInfo {
+      endCursor
+      hasNextPage
+    }
+    edges {
+      node {
+        tag {
+          name
+          target {
+            ... on Commit {
+              committedDate
+            }
+          }
+        }
+      }
+    }
+  }
+  fragment RepoInfo on Repository {
+    description
+    url
+      licenseInfo {
+        name
+        url
+        spdxId
+      }
+      createdAt
+      defaultBranchRef {
+        prefix
+        name
+      }
+      isArchived
+      isFork
+      name
+      owner {
+        ... on User {
+          name
+        }
+        ... on Organization {
+          name
+        }
+      }
+      pushedAt
+  }
+  """
+)
+
+_FETCH_BRANCHES_QUERY = gql(
+  """
+  query FetchBranches($repoOwner: String!, $repoName: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      refs(refPrefix:"refs/heads/", first: 100, after: $after){
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          name
+        }
+      }
+    }
+  }
+  """
+)
+
+_FETCH_RELEASES_QUERY = gql(
+  """
+  query FetchRelease($repoOwner: String!, $repoName: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      releases (first: 100, after: $after, orderBy: {field: CREATED_AT, direction: DESC} ){
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+        edges {
+          node {
+            name
+            tag {
+              name
+              target {
+                ... on Commit {
+                  committedDate
+                  oid
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  """
+)
+
+_FETCH_PARENT_RELEASES_QUERY = gql(
+  """
+  query FetchParrentRelease($repoOwner: String!, $repoName: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      parent {
+        releases (first: 100, after: $after, orderBy: {field: CREATED_AT, direction: DESC} ){
+          pageInfo {
+            endCursor
+            hasNextPage
+          }
+          edges {
+            node {
+              name
+              tag {
+                name
+                target {
+                  ... on Commit {
+                    committedDate
+                    oid
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  """
+)
+
+# Parent releases with only the fields get_last_parent_release_before() needs
+_FETCH_PARENT_RELEASE_DATES_QUERY = gql(
+  """
+  query FetchParentReleaseDates($repoOwner: String!, $repoName: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      parent {
+        releases (first: 100, after: $after, orderBy: {field: CREATED_AT, direction: DESC} ){
+          pageInfo {
+            endCursor
+            hasNextPage
+          }
+          edges {
+            node {
+              tag {
+                name
+                target {
+                  ... on Commit {
+                    committedDate
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  """
+)
+
+_FETCH_COMMITS_QUERY = gql(
+  """
+  query FetchCommits($repoOwner: String!, $repoName: String!, $ref: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      ref(qualifiedName: $ref) {
+        target {
+          ... on Commit {
+            history (first: 100, after: $after) {
+              pageInfo {
+                endCursor
+                hasNextPage
+              }
+              nodes {
+                oid
+                committedDate
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  """
+)
+
+_FETCH_COMMITS_PARENT_QUERY = gql(
+  """
+  query FetchCommits($repoOwner: String!, $repoName: String!, $ref: String!, $after: String){
+    repository (owner: $repoOwner, name: $repoName) {
+      parent {
+        ref(qualifiedName: $ref) {
+          target {
+            ... on Commit {
+              history (first: 100, after: $after) {
+                pageInfo {
+                  endCursor
+                  hasNextPage
+                }
+                nodes {
+                  oid
+                  committedDate
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+  """
+)
+
+# First commit page of the fork and of its parent, fetched together in one request
+_FETCH_FIRST_COMMITS_QUERY = gql(
+  """
+  query FetchFirstCommits($repoOwner: String!, $repoName: String!, $ref: String!, $parentRef: String!){
+    repository (owner: $repoOwner, name: $repoName) {
+      ref(qualifiedName: $ref) {
+        target {
+          ...FirstHistoryPage
+        }
+      }
+      parent {
+        ref(qualifiedName: $parentRef) {
+          target {
+            ...FirstHistoryPage
+          }
+        }
+      }
+    }
+  }
+  fragment FirstHistoryPage on Commit {
+    history (first: 100) {
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+      nodes {
+        oid
+        committedDate
+      }
+    }
+  }
+  """
+)
+
+# Names of up to 100 contributors, looked up by the node_id from the REST contributor list
+_FETCH_USERS_QUERY = gql(
+  """
+  query FetchUsers($ids: [ID!]!){
+    nodes(ids: $ids) {
+      ... on User {
+        login
+        name
+      }
+      ... on Bot {
+        login
+      }
+    }
+  }
+  """
+)
+
+def _seconds_until_retry(headers):
+  """Seconds until GitHub lifts the rate limit named in the response headers, None if there is none"""
+  retryAfter = headers.get('Retry-After')
+  if retryAfter != None:
+    # Retry-After is either a number of seconds or an HTTP date
+    try:
+      return max(0, int(retryAfter))
+    except ValueError:
+      pass
+    try:
+      return max(0, parsedate_to_datetime(retryAfter).timestamp() - time.time())
+    except (TypeError, ValueError):
+      return None
+  if headers.get('x-ratelimit-remaining') == "0":
+    # The primary rate limit is lifted at x-ratelimit-reset, given in epoch seconds
+    try:
+      return max(0, int(headers.get('x-ratelimit-reset')) - time.time())
+    except (TypeError, ValueError):
+      return None
+  return None
+
+def create_rest_session():
+  """Create a requests session for the GitHub REST api
+
+    The session keeps connections alive. It holds no credentials, so one session
+    can be shared by several GithubClient instances.
+  """
+  session = requests.Session()
+  session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+  session.headers.update({'Accept-Encoding': 'gzip'})
+  return session
+
 class GithubClient:
   """
   The access point to GitHub to retrieve required information for the DataCite format.
@@ -56,7 +450,7 @@ class GithubClient:
       list_commits(self, ref: str, after: str | None, parent: bool = False)
         Fetch one page of commits
   """
-  def __init__(self, repoOwner: str, repoName: str, githubApiUrl: str = "https://api.github.com", githubUrl: str = "https://github.com", barerToken: str | None = None):
+  def __init__(self, repoOwner: str, repoName: str, githubApiUrl: str = "https://api.github.com", githubUrl: str = "https://github.com", barerToken: str | None = None, rSession: requests.Session | None = None):
     """ Constructor
 
     Parameters:
@@ -69,23 +463,36 @@ class GithubClient:
       The URL to the GitHub instance. Default https://api.github.com
     barerToken: str | None, optional
       GitHub token used for authentication
+    rSession: requests.Session | None, optional
+      Shared session from create_rest_session() for the REST api, a new one is created if None
     """
 
     self.githubUrl = githubUrl
     self.githubRepoUrl = f"{githubUrl}/{repoOwner}/{repoName}"
     self.githubParentRepoUrl = ""
 
-    self.rSession = requests.Session()
+    # One keep-alive session for all REST requests, so the TLS connection is reused.
+    # The session may be shared, the token is sent with each request instead of stored in it.
+    self.rSession = rSession if rSession != None else create_rest_session()
     self.restBaseUrl = f"{githubApiUrl}/repos/{repoOwner}/{repoName}"
+    self.authHeaders = {}
+    # Identifies the repository and the token in process wide caches, without keeping the token itself
+    self.cacheKey = (self.restBaseUrl, hashlib.sha256((barerToken or "").encode()).hexdigest())
     if barerToken and barerToken != "":
-      self.transport = AIOHTTPTransport(url=f"{githubApiUrl}/graphql", headers={'Authorization': f'Bearer {barerToken}'})
-      self.rSession.headers.update({'Authorization': f'Bearer {barerToken}'})
+      self.authHeaders = {'Authorization': f'Bearer {barerToken}'}
+      self.transport = AIOHTTPTransport(url=f"{githubApiUrl}/graphql", headers=self.authHeaders)
     else:
       self.transport = AIOHTTPTransport(url=f"{githubApiUrl}/graphql")
-    self.client = Client(transport=self.transport, fetch_schema_from_transport=True)
+    # The queries are static and validated by GitHub, skip the large introspection request
+    self.client = Client(transport=self.transport, fetch_schema_from_transport=False)
+    # get_contributors() may run on another thread, a transport can only be connected once at a time
+    self.usersClient = Client(transport=AIOHTTPTransport(url=f"{githubApiUrl}/graphql", headers=self.authHeaders), fetch_schema_from_transport=False)
     self.repoOwner = repoOwner
     self.repoName = repoName
     self.checked_parent_branches = False
+    self.firstBranchPage = None
+    self.firstReleasePage = None
+    self.firstParentReleasePage = None
 
   def __send_request__(self, query: DocumentNode, options=None):
     """Execute a GraphQL api request
@@ -108,81 +515,137 @@ class GithubClient:
     params = {"repoOwner": self.repoOwner, "repoName": self.repoName}
     if options:
       params.update(options)
+    return self.__execute__(self.client, query, params)
 
-    try:
-      result = self.client.execute(query, variable_values=params)
-      return result
-    except ClientResponseError as e:
-      raise GithubException(e.message, e.status)
-    except TransportServerError as e:
-      message = e.__str__()
-      if e.code == 403:
-        message = "GitHub rate limit exceeded. Please us a GitHub API token or try again later."
-      raise GithubException(message, e.code)
-    except TransportQueryError as e:
-      raise GithubException(e.args[0], 500)
+  def __execute__(self, client: Client, query: DocumentNode, params: dict, allowPartial: bool = False):
+    """Execute a GraphQL query with the given client, retrying on rate limits
+
+      Parameters
+      ----------
+        allowPartial: bool, optional
+          Return the data of a response with errors instead of raising, if it has any
+
+      Raises
+      ------
+        GithubException
+          If there are any issues with the request.
+    """
+    attempt = 0
+    while True:
+      _rateLimiter.take()
+      try:
+        # asyncio.run closes its event loop, client.execute would leave one open on every new thread
+        return asyncio.run(client.execute_async(query, variable_values=params))
+      except ClientResponseError as e:
+        raise GithubException(e.message, e.status)
+      except TransportServerError as e:
+        time.sleep(self.__rate_limit_wait__(e.code, getattr(client.transport, "response_headers", None), attempt, e.__str__()))
+        attempt += 1
+      except TransportQueryError as e:
+        if allowPartial and e.data:
+          return e.data
+        raise GithubException(e.args[0], 500)
+
+  def __rest_get__(self, url: str):
+    """GET a REST api url, retrying on rate limits
+
+      Raises
+      ------
+        GithubException
+          If there are any issues with the request.
+    """
+    attempt = 0
+    while True:
+      _rateLimiter.take()
+      r = self.rSession.get(url, headers=self.authHeaders, timeout=REST_TIMEOUT)
+      if r.ok:
+        return r
+      try:
+        message = r.json()['message']
+      except (ValueError, KeyError, TypeError):
+        message = r.reason
+      time.sleep(self.__rate_limit_wait__(r.status_code, r.headers, attempt, message))
+      attempt += 1
+
+  def __rate_limit_wait__(self, status: int, headers, attempt: int, message: str):
+    """Seconds to wait before retrying a failed request
 
+      A 403 is only a rate limit if GitHub sent Retry-After or no requests are remaining,
+      any other 403 is a permission error that will never succeed on retry.
+
+      Raises
+      ------
+        GithubException
+          If the request was not rate limited, or the limit is not lifted in time.
+    """
+    headers = headers or {}
+    wait = _seconds_until_retry(headers)
+    if wait == None and status == 429:
+      wait = 2 ** attempt
+    if wait == None:
+      raise GithubException(message, status)
+    if attempt >= MAX_RATE_LIMIT_RETRIES or wait > MAX_RATE_LIMIT_WAIT:
+      raise GithubException(RATE_LIMIT_MESSAGE, status)
+    return wait
 
 
+  def __paginate__(self, page, fetch_page, key: str):
+    """Iterate over the items of a connection page and all following pages
+
+      Further pages are only requested while hasNextPage is set, so a
+      connection with at most 100 items costs no request beyond the first page.
+
+      Parameters
+      ----------
+        page: dict
+          The first page, containing pageInfo and the items
+        fetch_page: Callable[[str], dict]
+          Fetches the page after the given cursor
+        key: str
+          Name of the item list in the page, for example nodes or edges
+    """
+    yield from page[key]
+    while page['pageInfo']['hasNextPage']:
+      page = fetch_page(page['pageInfo']['endCursor'])
+      yield from page[key]
+
   def get_info(self):
     """Returns basic information from the GitHub repository
 
+      The first page of branches, releases and parent releases is fetched with the
+      same request and reused by list_branches(), list_releases() and
+      get_last_parent_release_before().
+
       Raises
       ------
         GithubException
           If there are any issues with the GraphQL request.
     """
-    query = gql(
-        """
-      query ReleaseInfo($repoOwner: String!, $repoName: String!) {
-        repository (owner: $repoOwner, name: $repoName) {
-          ...RepoInfo
-          parent {
-            defaultBranchRef {
-              prefix
-              name
-            }
-            name
-            isArchived
-            owner {
-              login
-            }
-          }
-        }
-      }
-      fragment RepoInfo on Repository {
-        description
-        url
-          licenseInfo {
-            name
-            url
-            spdxId
-          }
-          createdAt
-          defaultBranchRef {
-            prefix
-            name  
-          }
-          isArchived
-          isFork
-          name
-          owner {
-            ... on User {
-              name
-            }
-            ... on Organization {
-              name
-            }
-          }
-          pushedAt
-      }
-        """
-    )
-    data = self.__send_request__(query)['repository']
+    data, self.firstBranchPage, self.firstReleasePage, self.firstParentReleasePage = self.__cached__('info', self.__fetch_info__)
     if data['parent'] != None:
       self.githubParentRepoUrl = f"{self.githubUrl}/{data['parent']['owner']['login']}/{data['parent']['name']}"
     return data
 
+  def __fetch_info__(self):
+    data = self.__send_request__(_INFO_QUERY)['repository']
+    branchPage = data.pop('refs')
+    releasePage = self.__parse_releases__(data.pop('releases'))
+    parentReleasePage = None
+    if data['parent'] != None:
+      parentReleasePage = self.__parse_release_dates__(data['parent'].pop('releases'))
+    return data, branchPage, releasePage, parentReleasePage
+
+  def __cached__(self, name: str, fetch):
+    """Return the cached result of fetch for this repository, call fetch on a miss"""
+    key = (self.cacheKey, name)
+    with _repoCacheLock:
+      value = _repoCache.get(key)
+    if value == None:
+      value = fetch()
+      with _repoCacheLock:
+        _repoCache[key] = value
+    return value
+
 
   def get_contributors(self):
     """
@@ -191,10 +654,21 @@ class GithubClient:
     list
       A list of all contributors
     """
-    r = self.rSession.get(
-      f"{self.restBaseUrl}/contributors?sort=contributions"
-    )
-    return list(map(lambda d: self.rSession.get(d['url']).json(), r.json()))
+    contributors = []
+    url = f"{self.restBaseUrl}/contributors?sort=contributions&per_page=100"
+    while url:
+      r = self.__rest_get__(url)
+      contributors += r.json()
+      url = r.links.get('next', {}).get('url')
+
+    # The REST list has no names, fetch them for 100 contributors per GraphQL request
+    users = []
+    for i in range(0, len(contributors), 100):
+      batch = contributors[i:i + 100]
+      # An id that does not resolve is a null node with an error, the other nodes are still returned
+      nodes = self.__execute__(self.usersClient, _FETCH_USERS_QUERY, {"ids": [c['node_id'] for c in batch]}, allowPartial=True)['nodes']
+      users += [node or {'login': c['login']} for c, node in zip(batch, nodes)]
+    return users
 
   def get_last_common_commit(self, ref: str, parentRef: str):
     """Get last common commit between ref and parentRef
@@ -216,35 +690,34 @@ class GithubClient:
         commit
           the last common commit
     """
-    historyOne = self.list_commits(ref, None)
-    historyTwo = self.list_commits(parentRef, None, parent=True)
-    historyOneIter = iter(historyOne['nodes'])
-    historyTwoIter = iter(historyTwo['nodes'])
-    historyOneCurr = next(historyOneIter)
-    historyTwoCurr = next(historyTwoIter)
-    while historyOneCurr['oid'] != historyTwoCurr['oid']:
-      if datetime.fromisoformat(historyOneCurr['committedDate']) < datetime.fromisoformat(historyTwoCurr['committedDate']):
-        try:
-          historyTwoCurr = next(historyTwoIter)
-        except StopIteration:
-          if historyTwo['pageInfo']['hasNextPage']:
-            historyTwo = self.list_commits(ref, historyTwo['pageInfo']['endCursor'], parent=True)
-            historyTwoIter = iter(historyTwo['nodes'])
-            historyTwoCurr = next(historyTwoIter)
-          else:
-            return None
+    # Collect the commits of both histories page by page until they share a commit.
+    # The side whose oldest fetched commit is newer is extended first, so the first
+    # shared commits found contain the newest common commit.
+    historyOne, historyTwo = self.__list_first_commits__(ref, parentRef)
+    seenOne = {c['oid']: c for c in historyOne['nodes']}
+    seenTwo = {c['oid'] for c in historyTwo['nodes']}
+    common = [seenOne[oid] for oid in seenOne.keys() & seenTwo]
+    while not common:
+      hasNextOne = historyOne['pageInfo']['hasNextPage']
+      hasNextTwo = historyTwo['pageInfo']['hasNextPage']
+      if not hasNextOne and not hasNextTwo:
+        return None
+      # GitHub dates are UTC ISO 8601 strings (YYYY-MM-DDTHH:MM:SSZ), they order like the dates
+      if hasNextOne and (not hasNextTwo or historyOne['nodes'][-1]['committedDate'] >= historyTwo['nodes'][-1]['committedDate']):
+        historyOne = self.list_commits(ref, historyOne['pageInfo']['endCursor'])
+        seenOne.update((c['oid'], c) for c in historyOne['nodes'])
+        common = [c for c in historyOne['nodes'] if c['oid'] in seenTwo]
       else:
-        try:
-          historyOneCurr = next(historyOneIter)
-        except StopIteration:
-          if historyOne['pageInfo']['hasNextPage']:
-            historyOne = self.list_commits(ref, historyOne['pageInfo']['endCursor'])
-            historyOneIter = iter(historyOne['nodes'])
-            historyOneCurr = next(historyOneIter)
-          else:
-            return None
-    return historyOneCurr
-  
+        historyTwo = self.list_commits(parentRef, historyTwo['pageInfo']['endCursor'], parent=True)
+        seenTwo.update(c['oid'] for c in historyTwo['nodes'])
+        common = [c for c in historyTwo['nodes'] if c['oid'] in seenOne]
+    return max(common, key=lambda c: c['committedDate'])
+
+  def __list_first_commits__(self, ref: str, parentRef: str):
+    """Fetch the first page of commits of ref and of parentRef in the parent with one request"""
+    resp = self.__send_request__(_FETCH_FIRST_COMMITS_QUERY, {"ref": ref, "parentRef": parentRef})['repository']
+    return resp['ref']['target']['history'], resp['parent']['ref']['target']['history']
+
   def get_last_parent_release_before(self, after_date: str):
     """Get the las release before the given Date from the parent repository
     
@@ -263,50 +736,39 @@ class GithubClient:
         release
           The release object
     """
-    releases = self.list_parent_release(None)
+    page = self.firstParentReleasePage
+    if page == None:
+      page = self.__list_parent_release_dates__(None)
     while True:
-      for r in releases['edges']:
-        if datetime.fromisoformat(after_date) < datetime.fromisoformat(r['committedDate']):
-          return r
-      if releases['pageInfo']['hasNextPage']:
-        releases = self.list_parent_release(releases['pageInfo']['endCursor'])
-      else:
+      # The pages are ordered by creation, a release created later for an older tag breaks the
+      # order of committedDate. Each page is sorted before the binary search, releases on later
+      # pages are assumed to be older than the last release before after_date on this page.
+      edges = sorted(page['edges'], key=lambda r: r['committedDate'])
+      # Releases before index i are older than after_date, GitHub dates compare as strings
+      i = bisect.bisect_left(edges, after_date, key=lambda r: r['committedDate'])
+      if i > 0:
+        return edges[i - 1]
+      if not page['pageInfo']['hasNextPage']:
         return None
+      page = self.__list_parent_release_dates__(page['pageInfo']['endCursor'])
       
   def list_branches(self):
     """
     Lists all branch names from the repository
     """
-    page = self.__fetch_branch_page__(None)
-    branches = page['nodes']
-    while page['pageInfo']['hasNextPage']:
-      page = self.__fetch_branch_page__(after=page['pageInfo']['endCursor'])
-      branches = branches + page['nodes']
-    return branches
-    
+    return self.__cached__('branches', self.__list_branches__)
+
+  def __list_branches__(self):
+    page = self.firstBranchPage
+    if page == None:
+      page = self.__fetch_branch_page__(None)
+    return list(self.__paginate__(page, self.__fetch_branch_page__, 'nodes'))
 
   def __fetch_branch_page__(self, after: str | None):
-    query = gql(
-      """
-      query FetchBranches($repoOwner: String!, $repoName: String!, $after: String){
-        repository (owner: $repoOwner, name: $repoName) {
-          refs(refPrefix:"refs/heads/", first: 100, after: $after){
-            pageInfo {
-              hasNextPage
-              endCursor
-            }
-            nodes {
-              name
-            }
-          }
-        }
-      }
-    """
-    )
     options = None
     if after != None:
       options = {"after": after}
-    return self.__send_request__(query, options)['repository']['refs']
+    return self.__send_request__(_FETCH_BRANCHES_QUERY, options)['repository']['refs']
   
 
   def list_releases(self):
@@ -315,7 +777,7 @@ class GithubClient:
     
     Returns
     -------
-    A list of releases. 
+    A list of releases, newest first. 
     
     A release object will look like this (json format):
     {
@@ -326,51 +788,43 @@ class GithubClient:
 
     }
     """
-    releasePage = self.__fetch_releases__(None)
-    releases = releasePage['edges']
-    while(releasePage['pageInfo']['hasNextPage']):
-      releasePage = self.__fetch_releases__(releasePage['pageInfo']['endCursor'])
-      releases = releases + releasePage['edges']
-    return releases
+    return self.__cached__('releases', self.__list_releases__)
+
+  def __list_releases__(self):
+    releasePage = self.firstReleasePage
+    if releasePage == None:
+      releasePage = self.__fetch_releases__(None)
+    return list(self.__paginate__(releasePage, self.__fetch_releases__, 'edges'))
       
   def __fetch_releases__(self, after: str | None):
-    query = gql(
-      """
-      query FetchRelease($repoOwner: String!, $repoName: String!, $after: String){
-        repository (owner: $repoOwner, name: $repoName) {
-          releases (first: 100, after: $after, orderBy: {field: CREATED_AT, direction: ASC} ){
-            pageInfo {
-              endCursor
-              hasNextPage
-            } 
-            edges {
-              node {
-                name
-                tag {
-                  name
-                  target {
-                    ... on Commit {
-                      committedDate
-                      oid
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    """
-    )
     options = None
     if after:
       options = {"after": after}
-    resp = self.__send_request__(query, options)
-    resp = resp['repository']['releases']
-    resp['edges'] = list(filter(lambda a: 'committedDate' in a['node']['tag']['target'], resp['edges']))
-    resp['edges'] = list(map(lambda a: {"release_name": a['node']['name'], 'tag_name': a['node']['tag']['name'], 'committedDate': a['node']['tag']['target']['committedDate'], 'oid': a['node']['tag']['target']['oid']}, resp['edges']))
+    resp = self.__send_request__(_FETCH_RELEASES_QUERY, options)
+    return self.__parse_releases__(resp['repository']['releases'])
+
+  def __parse_releases__(self, resp):
+    # Filter and convert in one pass, tags that do not point to a commit are skipped
+    resp['edges'] = [
+      {"release_name": e['node']['name'], "tag_name": e['node']['tag']['name'], "committedDate": t['committedDate'], "oid": t['oid']}
+      for e in resp['edges'] if 'committedDate' in (t := e['node']['tag']['target'])
+    ]
     return resp
   
+  def __list_parent_release_dates__(self, after: str | None):
+    options = None
+    if after:
+      options = {"after": after}
+    resp = self.__send_request__(_FETCH_PARENT_RELEASE_DATES_QUERY, options)
+    return self.__parse_release_dates__(resp['repository']['parent']['releases'])
+
+  def __parse_release_dates__(self, resp):
+    resp['edges'] = [
+      {"tag_name": e['node']['tag']['name'], "committedDate": t['committedDate']}
+      for e in resp['edges'] if 'committedDate' in (t := e['node']['tag']['target'])
+    ]
+    return resp
+
   def list_parent_release(self, after: str | None):
     """Fetch one page of releases from the parent repository
     
@@ -387,45 +841,14 @@ class GithubClient:
       Returns
       -------
         releasesPage
-          releases with pageInfo and at most 100 release edges
+          releases with pageInfo and at most 100 release edges, newest first
     
     """
-    query = gql(
-      """
-      query FetchParrentRelease($repoOwner: String!, $repoName: String!, $after: String){
-        repository (owner: $repoOwner, name: $repoName) {
-          parent {
-            releases (first: 100, after: $after, orderBy: {field: CREATED_AT, direction: ASC} ){
-              pageInfo {
-                endCursor
-                hasNextPage
-              } 
-              edges {
-                node {
-                  name
-                  tag {
-                    name
-                    target {
-                      ... on Commit {
-                        committedDate
-                        oid
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-      """)
     options = None
     if after:
       options = {"after": after}
-    resp = self.__send_request__(query, options)
-    resp = resp['repository']['parent']['releases']
-    resp['edges'] = list(map(lambda a: {"release_name": a['node']['name'], "tag_name": a['node']['tag']['name'], "committedDate": a['node']['tag']['target']['committedDate'], "oid": a['node']['tag']['target']['oid']}, resp['edges']))
-    return resp
+    resp = self.__send_request__(_FETCH_PARENT_RELEASES_QUERY, options)
+    return self.__parse_releases__(resp['repository']['parent']['releases'])
 
   def list_commits(self, ref: str, after: str | None, parent: bool = False):
     """Fetch one page of commits
@@ -449,57 +872,14 @@ class GithubClient:
         releasesPage
           releases with pageInfo and at most 100 release edges
     """
-    query = gql(
-      """
-      query FetchCommits($repoOwner: String!, $repoName: String!, $ref: String!, $after: String){
-        repository (owner: $repoOwner, name: $repoName) {
-          ref(qualifiedName: $ref) {
-            target {
-              ... on Commit {
-                history (first: 100, after: $after) {
-                  pageInfo {
-                    endCursor
-                    hasNextPage
-                  }
-                  nodes {
-                    oid
-                    committedDate
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-      """
-    )
-    if parent:
-      query = gql(
-        """
-        query FetchCommits($repoOwner: String!, $repoName: String!, $ref: String!, $after: String){
-          repository (owner: $repoOwner, name: $repoName) {
-            parent {
-              ref(qualifiedName: $ref) {
-                target {
-                  ... on Commit {
-                    history (first: 100, after: $after) {
-                      pageInfo {
-                        endCursor
-                        hasNextPage
-                      }
-                      nodes {
-                        oid
-                        committedDate
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-      )
+    key = (self.cacheKey, ref, after, parent)
+    if after:
+      with _commitPageCacheLock:
+        page = _commitPageCache.get(key)
+      if page != None:
+        return page
+
+    query = _FETCH_COMMITS_PARENT_QUERY if parent else _FETCH_COMMITS_QUERY
     options = {
       "ref": ref
     }
@@ -508,4 +888,8 @@ class GithubClient:
     resp = self.__send_request__(query, options)['repository']
     if parent:
       resp = resp['parent']
-    return resp['ref']['target']['history']
+    page = resp['ref']['target']['history']
+    if after:
+      with _commitPageCacheLock:
+        _commitPageCache[key] = page
+    return page
@@ -23,16 +23,24 @@
 from flask import Flask, request
 from flask_cors import CORS
 from citation_translator import GithubRepoDataCite
+from github_client import create_rest_session
 import sys
 from exceptions import GithubException
 
 """
 Starts a simple Flask REST-Api server with one POST endpoint /generate
 to create the DataCite xml file.
+
+In production the app is served by gunicorn (see Dockerfile):
+  gunicorn --workers 4 --threads 4 --bind 0.0.0.0:80 rest_api:app
+Running this file directly starts the Flask development server.
 """
 
 app = Flask(__name__)
 port = 80
+# Shared by all requests so REST connections to GitHub are kept alive between them.
+# The GraphQL client is still created per request, its transport can not be used by two threads at once.
+rest_session = create_rest_session()
 
 CORS(app, origins="*")
 @app.post("/generate")
@@ -40,8 +48,8 @@ def add_country():
     if request.is_json:
         metadata = request.get_json()
         try:
-            repo_data = GithubRepoDataCite(metadata["owner"], metadata["project"], barerToken=metadata["apiToken"])
-            xml = repo_data.doc.toprettyxml()
+            repo_data = GithubRepoDataCite(metadata["owner"], metadata["project"], barerToken=metadata["apiToken"], rSession=rest_session)
+            xml = repo_data.pretty_xml()
             return xml, 201
         except GithubException as e:
             return e.message, e.code